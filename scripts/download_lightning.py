@@ -1,10 +1,14 @@
-import requests
 import json
 import datetime as dt
-import time
+import asyncio
 from pathlib import Path
 
-TODAY = dt.datetime.now() 
+import aiohttp
+import pandas as pd
+
+from hnl_fire_data.http import get_session
+
+TODAY = dt.datetime.now()
 TODAY_START = TODAY.replace(hour=0, minute=0, second=0, microsecond=0)
 TODAY_END = TODAY.replace(hour=23, minute=59, second=59, microsecond=999999)
 SERVICE_URL =  "https://fire.ak.blm.gov/arcgis/rest/services/MapAndFeatureServices/AK_Recorded_Lightning/FeatureServer/{0}/query"
@@ -16,85 +20,102 @@ DATASETS = {
     4: {'label': 'last_two_weeks', 'dayoffset': 4},
 }
 SELECTED = [0, 1, 2, 3, 4]  # which datasets we want
-AGGREGATE = True    # whether we want to aggregate the data into a single file 
+AGGREGATE = True    # whether we want to aggregate the data into a single file
 AGG_FN = f"all_lightning_{TODAY.year}.fth"
 OUTDIR = Path().absolute().parents[1] / "data/AICC_lightning"
+PAGE_SIZE = 2000     # max records per request
+MAX_CONCURRENT = 5   # cap on simultaneous in-flight requests
+MAX_RETRIES = 4      # attempts per page when the server throttles us
 
 def datadate(dsidx):
     """Get date of lightning data based on which service is accessed"""
     dayoffset = DATASETS[dsidx]['dayoffset']
     return TODAY_START - dt.timedelta(days=dayoffset)
 
-def download_lightning_data(dsidx=0):
-    """
-    Retrieve lightning data from a particular time from Alaska BLM ArcGIS Feature Service
-    """
-    
-    # Putting together tracking labels
-    # Convert to epoch timestamps (milliseconds)
-    
-    lightningday = datadate(dsidx)
-    print(f"Retrieving lightning data for: {lightningday.strftime('%Y-%m-%d')}")
-    
-    # Parameters for the query
+async def get_feature_count(session, url):
+    """Ask the service how many records match the query"""
+    params = {
+        'where': '2=2',
+        'returnCountOnly': 'true',
+        'f': 'json'
+    }
+    async with session.get(url, params=params) as response:
+        response.raise_for_status()
+        data = await response.json(content_type=None)
+    if 'error' in data:
+        print(f"Error from ArcGIS service: {data['error']}")
+        return 0
+    return data.get('count', 0)
+
+async def fetch_page(session, sem, url, offset, buffer):
+    """Fetch one page of features into its slice of a preallocated buffer,
+    backing off when the server throttles"""
     params = {
-        'where': f"2=2",
+        'where': '2=2',
         'outFields': '*',  # Get all attributes
         'returnGeometry': 'true',  # Include geometry (lat/lon)
         'f': 'json',  # Return format
-        'resultRecordCount': 2000,  # Max records per request
-        'resultOffset': 0  # Starting offset for pagination
+        'resultRecordCount': PAGE_SIZE,
+        'resultOffset': offset
     }
-    url = SERVICE_URL.format(dsidx)
-    all_features = []
-    offset = 0
-    
-    while True:
-        params['resultOffset'] = offset
-        
-        try:
-            print(f"Fetching records starting at offset {offset}...")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Check for errors in the response
+    async with sem:
+        for attempt in range(MAX_RETRIES):
+            try:
+                async with session.get(url, params=params) as response:
+                    if response.status == 429:
+                        # Throttled - wait with exponential backoff and retry
+                        await asyncio.sleep(2 ** attempt)
+                        continue
+                    response.raise_for_status()
+                    data = await response.json(content_type=None)
+            except aiohttp.ClientError as e:
+                print(f"Request error at offset {offset}: {e}")
+                return
+            except json.JSONDecodeError as e:
+                print(f"JSON decode error at offset {offset}: {e}")
+                return
             if 'error' in data:
                 print(f"Error from ArcGIS service: {data['error']}")
-                break
-            
+                return
             features = data.get('features', [])
-            
-            if not features:
-                print("No more records found.")
-                break
-            
-            all_features.extend(features)
-            print(f"Retrieved {len(features)} records (Total: {len(all_features)})")
-            
-            # Check if we got fewer records than requested (indicates end of data)
-            if len(features) < params['resultRecordCount']:
-                break
-            
-            offset += len(features)
-            
-            # Small delay to be respectful to the server
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
-            break
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            break
+            buffer[offset:offset + len(features)] = features
+            print(f"Retrieved {len(features)} records at offset {offset}")
+            return
+        print(f"Giving up on offset {offset} after {MAX_RETRIES} throttled attempts")
+
+async def download_lightning_data(dsidx=0, session=None):
+    """
+    Retrieve lightning data from a particular time from Alaska BLM ArcGIS Feature Service
+
+    Pages are fetched concurrently, with a semaphore keeping the number of
+    in-flight requests polite.
+    """
+    lightningday = datadate(dsidx)
+    print(f"Retrieving lightning data for: {lightningday.strftime('%Y-%m-%d')}")
+
+    url = SERVICE_URL.format(dsidx)
+    async with get_session(session) as session:
+        total = await get_feature_count(session, url)
+        if not total:
+            print("No records found.")
+            return []
+        # Preallocate one buffer sized from the count query; every page writes
+        # straight into its own slice, so there are no per-page lists and no
+        # flattening copy at the end.
+        buffer = [None] * total
+        sem = asyncio.Semaphore(MAX_CONCURRENT)
+        await asyncio.gather(
+            *[fetch_page(session, sem, url, offset, buffer)
+              for offset in range(0, total, PAGE_SIZE)])
+    all_features = [feature for feature in buffer if feature is not None]
+    print(f"Retrieved {len(all_features)} of {total} records")
     return all_features
 
-def get_lightning_data(dsidx=0):
+async def get_lightning_data(dsidx=0, session=None):
     """
     Retrieve and attach metadata
-    """  
-    features = download_lightning_data(dsidx=dsidx)
+    """
+    features = await download_lightning_data(dsidx=dsidx, session=session)
     lightningdate = datadate(dsidx)
     # Prepare data for saving
     output_data = {
@@ -107,18 +128,30 @@ def get_lightning_data(dsidx=0):
         },
         'features': features
     }
-    return output_data
+    return dsidx, output_data
 
 
 def save_data(features_with_metadata, filename=None):
     """
-    Save the lightning data to a JSON file
+    Save the lightning data as Feather, with a small JSON metadata sidecar
     """
-    label = features_with_metadata['metadata']['data_label']
-    filename = f"alaska_lightning_{TODAY.strftime('%Y%m%d')}_{label}.json"
+    metadata = features_with_metadata['metadata']
+    features = features_with_metadata['features']
+    label = metadata['data_label']
+    filename = f"alaska_lightning_{TODAY.strftime('%Y%m%d')}_{label}.fth"
 
-    with open(OUTDIR / filename, 'w') as f:
-        json.dump(features_with_metadata, f, indent=2)
+    # Flatten the features into a table: one column per attribute plus the
+    # point coordinates. Arrow IPC is much smaller and faster to (re)read
+    # than the old indented JSON dump of the raw feature list.
+    df = pd.DataFrame.from_records(
+        [{**feature['attributes'],
+          'x': feature.get('geometry', {}).get('x'),
+          'y': feature.get('geometry', {}).get('y')} for feature in features])
+    df.to_feather(OUTDIR / filename)
+    # metadata_ prefix keeps the sidecar out of the notebooks' glob for the
+    # old full-feature dumps (alaska_lightning_*.json)
+    with open(OUTDIR / f"metadata_{Path(filename).stem}.json", 'w') as f:
+        json.dump(metadata, f, indent=2)
     print(f"Data saved to {filename}")
     return filename
 
@@ -129,46 +162,55 @@ def print_summary(features):
     if not features:
         print("No lightning data found for yesterday.")
         return
-    
+
     print(f"\n=== LIGHTNING DATA SUMMARY ===")
     print(f"Total records: {len(features)}")
-    
+
     # Sample the first record to show available attributes
     if features:
         sample_attrs = features[0].get('attributes', {})
         print(f"\nAvailable attributes:")
         for key in sample_attrs.keys():
             print(f"  - {key}")
-        
+
         print(f"\nSample record:")
         print(f"  Attributes: {sample_attrs}")
         if 'geometry' in features[0]:
             geom = features[0]['geometry']
             print(f"  Geometry: {geom}")
 
-def main():
+async def main_async():
     """
-    Main function to retrieve and process lightning data
+    Retrieve all selected datasets concurrently over one shared session
     """
-    print("Alaska Lightning Data Retrieval Tool")
-    print("=" * 40)
-    
-    # Retrieve the data
-    for idx in SELECTED:
-        features_with_metadata = get_lightning_data(idx)
-    
-    # Print summary
+    async with get_session() as session:
+        results = await asyncio.gather(
+            *(get_lightning_data(idx, session=session) for idx in SELECTED))
+
+    loop = asyncio.get_running_loop()
+    for idx, features_with_metadata in results:
+        # Print summary
         print_summary(features_with_metadata['features'])
-    
-    # Save data if any was found
+
+        # Save data if any was found
         if features_with_metadata['features']:
-            filename = save_data(features_with_metadata)
+            # json.dump of a big feature list blocks, so hand it to a worker thread
+            filename = await loop.run_in_executor(None, save_data, features_with_metadata)
             print(f"\nSuccessfully retrieved {len(features_with_metadata['features'])} lightning records")
             print(f"Data saved to: {filename}")
         else:
             print(f"\nNo lightning data found for {DATASETS[idx]['label'].replace('_',' ')}.")
 
-    # Create ground strokes and daily lightning file 
-    
+    # Create ground strokes and daily lightning file
+
+def main():
+    """
+    Main function to retrieve and process lightning data
+    """
+    print("Alaska Lightning Data Retrieval Tool")
+    print("=" * 40)
+
+    asyncio.run(main_async())
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -72,8 +72,7 @@ def main() -> None:
 
     # step 3: clean up, remove Rx and FA fires, add PSAs, save again
     all_updates.dropna(subset=['Incident Type'], inplace=True) # remove rows with no incident type (Complexes)
-    for it in EXCLUDE_TYPES: 
-        all_updates = all_updates.query(f"`Incident Type` != '{it}'")  # remove excluded incident types
+    all_updates = all_updates[~all_updates['Incident Type'].isin(EXCLUDE_TYPES)]  # remove excluded incident types
     all_updates_PSA = ft.add_psa(all_updates, projdir=PROJDIR)
     all_updates_PSA.to_csv(OUTDIR / f"all_updates_filtered_withPSA_{YEAR}_{TODAY}.csv", float_format='%.1f')
     
@@ -1,10 +1,45 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
 import requests
 
 __version__ = '0.1'
 
+CACHE_DIR = Path.home() / ".cache/hnl_fire_data/esri"
+CACHE_TTL = 24 * 3600  # seconds before a cached service response goes stale
+TIMEOUT = 30  # seconds per request
+
+# One pooled session for all service queries: keep-alive reuses the TCP/TLS
+# connection to fire.ak.blm.gov across calls instead of handshaking per call.
+SESSION = requests.Session()
+SESSION.headers.update({'Accept-Encoding': 'gzip'})
+
 def print_hello():
     print("Hello World!")
 
+def cached_json(url, params=None, ttl=CACHE_TTL):
+    """
+    GET a JSON resource, memoized on disk with a TTL
+
+    ArcGIS service schemas change rarely, so responses are cached in
+    CACHE_DIR keyed on a hash of the URL plus query parameters. A cached
+    file older than ttl seconds is refetched.
+    """
+    params = params or {}
+    key = hashlib.sha1(
+        json.dumps([url, sorted(params.items())]).encode()).hexdigest()
+    cachefp = CACHE_DIR / f"{key}.json"
+    if cachefp.exists() and time.time() - cachefp.stat().st_mtime < ttl:
+        return json.loads(cachefp.read_text())
+    response = SESSION.get(url, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cachefp.write_text(json.dumps(data))
+    return data
+
 def explore_service(url, servicelayer=0):
     """
     Explore the ArcGIS service to understand its structure
@@ -12,10 +47,8 @@ def explore_service(url, servicelayer=0):
     print("Exploring ArcGIS service structure...")
     
     try:
-        response = requests.get(f"{url}?f=json")
-        response.raise_for_status()
-        service_info = response.json()
-        
+        service_info = cached_json(url, params={'f': 'json'})
+
         print(f"Service Name: {service_info.get('serviceDescription', 'N/A')}")
         print(f"Layers: {len(service_info.get('layers', []))}")
         
@@ -24,9 +57,7 @@ def explore_service(url, servicelayer=0):
         
         # Get layer 0 details
         layer_url = f"{url}/{servicelayer}"
-        response = requests.get(f"{layer_url}?f=json")
-        response.raise_for_status()
-        layer_info = response.json()
+        layer_info = cached_json(layer_url, params={'f': 'json'})
         
         print(f"\nLayer {servicelayer} Details:")
         print(f"  Name: {layer_info.get('name', 'N/A')}")
@@ -45,9 +76,7 @@ def explore_service(url, servicelayer=0):
             'returnCountOnly': 'true',
             'f': 'json'
         }
-        response = requests.get(query_url, params=test_params)
-        response.raise_for_status()
-        count_result = response.json()
+        count_result = cached_json(query_url, params=test_params)
         if 'count' in count_result:
             print(f"  Total records in service: {count_result['count']}")
         return layer_info
@@ -1,12 +1,21 @@
 # Tools for retrieving and aggregating AK burned area daily tally
 # from situation reports at AICC. 
 
-import pandas as pd
-import geopandas as gp
-import requests
+import asyncio
 import datetime as dt
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import aiohttp
+import numpy as np
+import pandas as pd
+import geopandas as gp
+import shapely
+
+from hnl_fire_data.http import get_session
+
 PSA_relative_path = "resources/AK_predictive_service_areas.json"
 PROTECTING_OFFICES = {'MSS': 'Mat-Su Area',
         'TNF': 'Tongass N.F.',
@@ -21,6 +30,12 @@ PROTECTING_OFFICES = {'MSS': 'Mat-Su Area',
         'TAS': 'Tok Area',
         'GAD': 'Galena Zone',
         'SWS': 'Southwest Area'}
+PROTECTING_OFFICES_REV = {v: k for k, v in PROTECTING_OFFICES.items()} | {'n/a': 'n/a'}
+# three-letter zone code in "... (XXX)"; kept as a plain string pattern with
+# a named group because str.extract on Arrow-backed columns hands the pattern
+# to pyarrow's regex engine, which takes neither compiled patterns nor
+# anonymous groups
+_ZONE_RE = r'\((?P<code>[A-Z]{3})\)'
 GROUPINGS = {
         'PSA': ['reportdate', 'PSA_NAME', 'NAT_CODE'],
         'Zone': ['reportdate', 'Protecting Office', 'Protecting Office Label']
@@ -28,77 +43,209 @@ GROUPINGS = {
 PLOTVAR_idx = {'PSA': 1, 'Zone': 1} # which column to plot for region by GROUPINGS list index
 PLOTSTARTDATE = '2025-05-14'  # start plotting from this date
 YEAR = 2025
+MAX_CONCURRENT_DOWNLOADS = 5  # in-flight request cap for the AICC server
+DOWNLOAD_RETRIES = 3          # attempts per URL for transient failures
+BACKOFF_FACTOR = 0.3          # seconds, doubled on each retry
+
+async def conditional_get(session: aiohttp.ClientSession,
+                          url: str,
+                          outpath: Path) -> tuple:
+    """GET a URL, sending cached validators so unchanged files come back as 304
+
+    ETag/Last-Modified headers are kept in a sidecar file next to the
+    download; returns (status, content) with content None unless status is 200.
+    """
+    headers = {}
+    etagpath = outpath.with_suffix('.etag')
+    if etagpath.exists() and outpath.exists():
+        validators = json.loads(etagpath.read_text())
+        if 'ETag' in validators:
+            headers['If-None-Match'] = validators['ETag']
+        if 'Last-Modified' in validators:
+            headers['If-Modified-Since'] = validators['Last-Modified']
+    async with session.get(url, headers=headers) as response:
+        if response.status != 200:
+            return response.status, None
+        content = await response.read()
+        validators = {key: response.headers[key]
+                      for key in ('ETag', 'Last-Modified') if key in response.headers}
+        if validators:
+            etagpath.write_text(json.dumps(validators))
+        return response.status, content
+
+async def _get_with_retries(session: aiohttp.ClientSession,
+                            url: str,
+                            outpath: Path) -> tuple:
+    """conditional_get with exponential backoff on transient failures"""
+    status, content = 0, None
+    for attempt in range(DOWNLOAD_RETRIES):
+        try:
+            status, content = await conditional_get(session, url, outpath)
+        except aiohttp.ClientError as e:
+            print(f"Request error for {url}: {e}")
+            status, content = 0, None
+        if status and status < 500:
+            return status, content
+        await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+    return status, content
+
+async def _fetch_report(session: aiohttp.ClientSession,
+                        sem: asyncio.Semaphore,
+                        urls: list,
+                        outpath: Path,
+                        downloaded: list) -> None:
+    """Fetch one report, trying the monthly-subfolder URL then the flat URL"""
+    async with sem:
+        for URL in urls:
+            status, content = await _get_with_retries(session, URL, outpath)
+            if status == 304:
+                print(f"Unchanged on server, keeping local copy: {outpath.name}")
+                return
+            if status == 200:
+                with open(outpath, 'wb') as dst:
+                    dst.write(content)
+                print(f"Downloaded {URL}")
+                downloaded.append(outpath.stem[-8:])
+                return
+        print(f"File not present on server: {urls[-1]}")
 
-def download_reports(startdatestr: str, 
-                     URLtemplate: str, 
+async def _download_reports_async(startdatestr: str,
+                                  URLtemplate: str,
+                                  fntemplate: str,
+                                  outdir: Path,
+                                  overwrite: bool=False,
+                                  session: aiohttp.ClientSession=None) -> str:
+    """Download all missing reports concurrently over one session"""
+    downloaded = []
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    async with get_session(session) as session:
+        tasks = []
+        for item in pd.date_range(startdatestr,dt.datetime.now().strftime("%Y%m%d"), freq='d'):
+            thedate = item.strftime('%Y%m%d')
+            outpath = outdir / f"{fntemplate}{thedate}.xlsx"
+            if outpath.exists() and not overwrite:
+                print(f"File {outpath} already exists. Skipping download.")
+                continue
+            urls = [f"{URLtemplate}{item.strftime('%m_%Y')}/{fntemplate}{thedate}.xlsx",
+                    f"{URLtemplate}{fntemplate}{thedate}.xlsx"]
+            tasks.append(_fetch_report(session, sem, urls, outpath, downloaded))
+        await asyncio.gather(*tasks)
+    return max(downloaded) if downloaded else None
+
+def download_reports(startdatestr: str,
+                     URLtemplate: str,
                      fntemplate: str,
-                     outdir: Path, 
+                     outdir: Path,
                      overwrite: bool=False) -> str:
     """Download situation reports from AICC site"""
-    lastdate = None
-    for item in pd.date_range(startdatestr,dt.datetime.now().strftime("%Y%m%d"), freq='d'):
-        thedate = item.strftime('%Y%m%d')
-        outpath = outdir / f"{fntemplate}{thedate}.xlsx"
-        if outpath.exists() and not overwrite:
-            print(f"File {outpath} already exists. Skipping download.")
-            continue
-        URL = URL = f"{URLtemplate}{item.strftime('%m_%Y')}/{fntemplate}{thedate}.xlsx"
-        response = requests.get(URL)
-        if response.status_code == 200:
-            with open(outpath, 'wb') as dst:
-                dst.write(response.content)
-            print(f"Downloaded {URL}")
-            lastdate = thedate
-        else:
-            URL = f"{URLtemplate}{fntemplate}{thedate}.xlsx"
-            response = requests.get(URL)
-            if response.status_code == 200:
-                with open(outpath, 'wb') as dst:
-                    dst.write(response.content)
-                print(f"Downloaded {URL}")
-                lastdate = thedate
-            else:
-                print(f"File not present on server: {URL}")
-    return lastdate
-
-def extract_zone(row: pd.Series) -> str:
-    """Extract the short version of the Protecting Office / FM Zone"""
-    try:
-        idx = row['Protecting Office'].find('(')
-        return PROTECTING_OFFICES[row['Protecting Office'][idx+1:idx+4]]
-    except KeyError:
-        try:
-            return PROTECTING_OFFICES[row['Protecting Office']]
-        except KeyError:
-            return row['Protecting Office']
-        
-def assemble_dataframe(datadir:Path, 
+    return asyncio.run(_download_reports_async(startdatestr,
+                                               URLtemplate,
+                                               fntemplate,
+                                               outdir,
+                                               overwrite=overwrite))
+
+def _read_one(fp: Path) -> pd.DataFrame:
+    """Parse a single downloaded report into a DataFrame
+
+    Published reports are immutable, so the parsed frame is cached as a
+    Parquet sidecar and reused as long as it is newer than the XLSX.
+    """
+    cachefp = fp.with_suffix('.parquet')
+    if cachefp.exists() and cachefp.stat().st_mtime >= fp.stat().st_mtime:
+        return pd.read_parquet(cachefp, dtype_backend='pyarrow')
+    current = pd.read_excel(fp, engine='calamine', dtype_backend='pyarrow')
+    # broadcast one Timestamp scalar instead of a string column that would
+    # need a full to_datetime pass after concatenation
+    current['reportdate'] = pd.Timestamp(fp.stem[-8:])
+    current.to_parquet(cachefp)
+    return current
+
+def assemble_dataframe(datadir:Path,
                        fntemplate: str) -> pd.DataFrame:
-    """Construct this year's dataframe from downloaded files"""
-    results = []
-    for fp in datadir.glob(f'{fntemplate}*'):
-        datestamp = fp.stem[-8:]
-        current = pd.read_excel(fp)
-        current['reportdate'] = datestamp
-        current.drop(columns=['OBJECTID'], inplace=True)
-        results.append(current)
-    all_updates = pd.concat(results).sort_values(['reportdate'], ignore_index=True)
-    all_updates['reportdate'] = pd.to_datetime(all_updates['reportdate'])
+    """Construct this year's dataframe from downloaded files
+
+    A concatenated cache of everything parsed so far is kept next to the
+    reports; runs after the first only parse files whose report date is
+    newer than the cache and append them, so steady-state assembly cost
+    is O(new reports).
+    """
+    cachefp = datadir / 'all_updates_cache.parquet'
+    files = sorted(datadir.glob(f'{fntemplate}*.xlsx'))
+    newest_mtime = max((fp.stat().st_mtime for fp in files), default=0)
+    cached = None
+    if cachefp.exists():
+        cached = pd.read_parquet(cachefp, dtype_backend='pyarrow')
+        if cachefp.stat().st_mtime >= newest_mtime:
+            # cache is at least as new as every report on disk: skip the
+            # per-file freshness checks and the cache rewrite entirely
+            files = []
+        else:
+            # parse exactly the dates the cache is missing - unlike a
+            # newer-than-max check, this also backfills gaps in the middle
+            # of the season
+            cached_dates = set(cached['reportdate'].dt.strftime('%Y%m%d'))
+            files = [fp for fp in files if fp.stem[-8:] not in cached_dates]
+    if cached is not None and not files:
+        all_updates = cached
+    else:
+        results = []
+        if files:
+            # calamine releases the GIL while parsing, so threads give the same
+            # parallelism as processes without pickling frames across workers
+            with ThreadPoolExecutor() as executor:
+                results = list(executor.map(_read_one, files))
+        if cached is not None:
+            results.insert(0, cached)
+        all_updates = pd.concat(results, copy=False, sort=False).sort_values(
+            ['reportdate'], ignore_index=True)
+        # one drop after concat instead of a block-manager reshuffle per file;
+        # errors='ignore' covers frames from the cache, which lack the column
+        all_updates.drop(columns=['OBJECTID'], inplace=True, errors='ignore')
+        all_updates.to_parquet(cachefp)
+    # Cache-warm runs read reportdate back as an Arrow timestamp while cold
+    # runs produce datetime64[ns] from the Timestamp scalar; normalize so
+    # downstream consumers (seaborn chokes on Arrow timestamps) always see
+    # numpy datetimes.
+    all_updates['reportdate'] = all_updates['reportdate'].astype('datetime64[ns]')
     all_updates['Narrative'] = all_updates['Narrative'].str.replace(r'[\n\r]', ' ', regex=True)
     all_updates['Fire Number'] = all_updates['Fire Number'].fillna(0).astype(int)
-    all_updates['Protecting Office'] = all_updates['Protecting Office'].fillna("n/a")
-    all_updates['Protecting Office'] = all_updates.apply(extract_zone, axis=1)
-    protecting_offices_rev = {
-        PROTECTING_OFFICES[key]: key for key in PROTECTING_OFFICES
-    }
-    protecting_offices_rev['n/a'] = 'n/a'
-    all_updates['Protecting Office Label'] = all_updates['Protecting Office'].map(protecting_offices_rev)
+    po = all_updates['Protecting Office'].fillna("n/a")
+    # Normalize every entry to its three-letter code: pull the code out of
+    # "... (XXX)" entries, fall back to full names that are already in the
+    # reverse lookup, then to the original string. Making the codes a
+    # Categorical means the code -> full name lookup below runs once per
+    # category instead of once per row.
+    codes = pd.Categorical(
+        po.str.extract(_ZONE_RE, expand=False)
+          .fillna(po.map(PROTECTING_OFFICES_REV))
+          .fillna(po))
+    all_updates['Protecting Office Label'] = codes
+    all_updates['Protecting Office'] = codes.rename_categories(
+        {code: PROTECTING_OFFICES.get(code, code) for code in codes.categories})
     return all_updates
 
+@functools.lru_cache(maxsize=4)
+def _load_psa(psafp: str) -> gp.GeoDataFrame:
+    """Load the PSA layer, preferring the GeoParquet sidecar
+
+    Cached on the (string, hence hashable) file path so repeated joins in
+    one session parse the file at most once.
+    """
+    psafp = Path(psafp)
+    cachefp = psafp.with_suffix('.parquet')
+    if cachefp.exists() and cachefp.stat().st_mtime >= psafp.stat().st_mtime:
+        return gp.read_parquet(cachefp)
+    psa_GDF = gp.read_file(psafp)
+    psa_GDF.to_parquet(cachefp)
+    return psa_GDF
+
 def get_psaGDF(projdir: Path) -> gp.GeoDataFrame:
-    """Load PSA boundaries as GeoDataframe"""
-    psafp = projdir / PSA_relative_path
-    return gp.read_file(psafp)
+    """Load PSA boundaries as GeoDataframe
+
+    The boundaries are static, so the parsed layer is cached as GeoParquet
+    on disk across runs and memoized in memory within a run.
+    """
+    return _load_psa(str(projdir / PSA_relative_path))
 
 def gdf_from_df(updatesDF: pd.DataFrame) -> gp.GeoDataFrame:
     """Turn pandas DataFrame into GeoDataframe"""
@@ -107,51 +254,74 @@ def gdf_from_df(updatesDF: pd.DataFrame) -> gp.GeoDataFrame:
 
 def add_psa(all_updatesDF: pd.DataFrame, 
             projdir: Path) -> gp.GeoDataFrame:
-    """Join all updates with PSA boundaries"""
+    """Join all updates with PSA boundaries
+
+    With only a handful of PSA polygons against thousands of report points,
+    a vectorized contains test per polygon beats the general sjoin
+    machinery (STRtree build plus per-candidate predicate calls).
+    """
     psa_GDF = get_psaGDF(projdir=projdir)
-    all_updates_GDF = gdf_from_df(all_updatesDF)
-    joined_GDF = gp.sjoin(all_updates_GDF, psa_GDF, predicate='within', how='inner')
-    joined_GDF.drop(columns=['index_right', 'GACC', 'ID'], inplace=True)
-    return joined_GDF
+    # Rows without coordinates can never match a polygon - drop them before
+    # they enter the spatial predicate.
+    all_updatesDF = all_updatesDF.dropna(subset=['Latitude', 'Longitude'])
+    xs = all_updatesDF['Longitude'].to_numpy(dtype=float)
+    ys = all_updatesDF['Latitude'].to_numpy(dtype=float)
+    psa_idx = np.full(len(all_updatesDF), -1)
+    for i, poly in enumerate(psa_GDF.geometry):
+        unassigned = psa_idx == -1
+        if not unassigned.any():
+            break
+        psa_idx[unassigned & shapely.contains_xy(poly, xs, ys)] = i
+    matched = psa_idx >= 0
+    psa_attrs = psa_GDF.drop(columns=['geometry', 'GACC', 'ID']).iloc[
+        psa_idx[matched]].reset_index(drop=True)
+    joined = pd.concat(
+        [all_updatesDF.loc[matched].reset_index(drop=True), psa_attrs], axis=1)
+    # Dense dtypes for the aggregation stage: category codes hash far more
+    # cheaply than strings as group keys, and float32 is ample precision
+    # for acreages while halving the bytes moved.
+    for col in ('PSA_NAME', 'NAT_CODE'):
+        joined[col] = joined[col].astype('category')
+    joined['Acres'] = joined['Acres'].astype('float32')
+    return gdf_from_df(joined)
 
 def aggregate_by_day_region(updatesDF: pd.DataFrame,
                             region: str) -> pd.DataFrame:
     """Aggregate daily burned area by region. Region is one of GROUPINGS keys."""
-    try:
-        dailyarea_agg = updatesDF[
-            GROUPINGS[region] + ['Acres']].groupby(GROUPINGS[region]).sum().reset_index()
-    except KeyError:
-        print(f"Grouping by {region} is unknown. Try one of : {', '.join(GROUPINGS.keys())}")
-    dailyarea_agg['Acres'] = dailyarea_agg['Acres'].replace(0, pd.NA)
-    dailyarea_agg.dropna(inplace=True)
-    return dailyarea_agg
+    if region not in GROUPINGS:
+        raise KeyError(
+            f"Grouping by {region} is unknown. Try one of : {', '.join(GROUPINGS.keys())}")
+    dailyarea_agg = updatesDF.groupby(
+        GROUPINGS[region], as_index=False, sort=False, observed=True)['Acres'].sum()
+    return dailyarea_agg[dailyarea_agg['Acres'] != 0]
 
 def load_old_data(olddatafp: Path) -> pd.DataFrame:
     """Load old data from the file"""
     if not olddatafp.exists():
         raise FileNotFoundError(f"Old data file {olddatafp} does not exist.")
-    olddata = pd.read_csv(olddatafp, skiprows=2)
-    dropcols = [col for col in olddata.columns if col.startswith('Unname')] 
-    olddata.drop(columns=dropcols+['ID'], inplace=True)
-    intcols = list(olddata.columns.difference(['TotalAcres', 'ProtectionUnit', 'SitReportDate']))
+    # Peek at the header only, then read just the columns we keep, so the
+    # unnamed filler columns, ID and SitReportDate are never materialized.
+    header = pd.read_csv(olddatafp, skiprows=2, nrows=0)
+    keepcols = [col for col in header.columns
+                if not col.startswith('Unname') and col not in ('ID', 'SitReportDate')]
+    olddata = pd.read_csv(olddatafp, skiprows=2, usecols=keepcols, dtype_backend='pyarrow')
+    intcols = list(olddata.columns.difference(['TotalAcres', 'ProtectionUnit']))
     print(intcols)
     for col in intcols:
         if olddata[col].isna().any():
             olddata.drop(columns=[col], inplace=True)
-        try:
-            olddata[col] = olddata[col].astype(int)
-        except KeyError: 
-            pass
+            continue
+        olddata[col] = olddata[col].astype(int)
     olddata.rename(columns={'FireSeason': 'Year'}, inplace=True)
     olddata['reportdate'] = pd.to_datetime(olddata[['Year', 'Month', 'Day']])
-    olddata.drop(columns=['SitReportDate'], inplace=True)
     olddata.rename({'TotalAcres': 'Acres'}, axis=1, inplace=True)
     return olddata
 
 def olddata_to_daily(olddata: pd.DataFrame) -> pd.DataFrame:
     """Convert old data to daily format"""
     olddata.drop(columns=['Month', 'Day', 'TotalFires', 'ProtectionUnit'], inplace=True)
-    olddata = olddata.groupby(['reportdate', 'Year']).sum().reset_index()
+    olddata = olddata.groupby(['reportdate', 'Year'], as_index=False, sort=False,
+                              observed=True).sum(numeric_only=True)
     olddata.rename({'TotalAcres': 'Acres'}, axis=1, inplace=True)
     return olddata
 
@@ -170,13 +340,13 @@ def combine_daily_totals(olddata: pd.DataFrame,
     combined = pd.concat([olddata, dailyarea], ignore_index=True)
     return combined
 
-def plot_dailyarea_by_region(dailyareaDF: pd.DataFrame,
-                             region: str,
-                             areathreshold: int=3000,
-                             figdir: Path=None,
-                             plotday: str=None,
-                             savefig=True) -> None:
-    """Plot daily burned area by region"""
+@functools.lru_cache(maxsize=1)
+def _plot_ctx():
+    """Import the plotting stack and apply the house style, once per process
+
+    Keeps the heavyweight matplotlib/seaborn imports out of module import
+    and out of every plot call; the style setup is idempotent anyway.
+    """
     import matplotlib.pyplot as plt
     import matplotlib as mpl
     import seaborn as sns
@@ -184,75 +354,116 @@ def plot_dailyarea_by_region(dailyareaDF: pd.DataFrame,
     mpl.rcParams['figure.dpi'] = 150
     sns.set_theme('paper')
     sns.set_style('whitegrid')
+    return plt, mpl, sns, cc
+
+def plot_dailyarea_by_region(dailyareaDF: pd.DataFrame,
+                             region: str,
+                             areathreshold: int=3000,
+                             figdir: Path=None,
+                             plotday: str=None,
+                             savefig=True,
+                             ax=None) -> None:
+    """Plot daily burned area by region
+
+    Pass an existing Axes to reuse one Figure across batched calls
+    (clear it with ax.cla() between plots); it is then left open for
+    the caller.
+    """
+    plt, mpl, sns, cc = _plot_ctx()
     if region not in GROUPINGS.keys():
         raise ValueError(f"Region {region} not recognized. Try one of {', '.join(GROUPINGS.keys())}")
     PLOTVAR = GROUPINGS[region][PLOTVAR_idx[region]]
+    # .loc[PLOTSTARTDATE:] needs a sorted DatetimeIndex to work (and to be a
+    # bisect instead of a scan); on the default RangeIndex it selected nothing.
+    dailyareaDF = dailyareaDF.set_index('reportdate').sort_index()
     infix = ''
     if areathreshold:
-        big_fires_regions = dailyareaDF[dailyareaDF.Acres > areathreshold].sort_values(
-            'Acres', ascending=False).drop_duplicates(PLOTVAR)[PLOTVAR].to_list()
-        dailyareaDF = dailyareaDF[dailyareaDF[PLOTVAR].isin(big_fires_regions)].loc[PLOTSTARTDATE:]
+        # per-region maxima instead of sorting the whole masked frame just
+        # to keep the top row per region; only the small aggregate is sorted
+        big_fires_regions = dailyareaDF.loc[dailyareaDF['Acres'] > areathreshold].groupby(
+            PLOTVAR, sort=False, observed=True)['Acres'].max().sort_values(
+            ascending=False).index.to_list()
+        dailyareaDF = dailyareaDF[dailyareaDF[PLOTVAR].isin(big_fires_regions)].loc[
+            pd.Timestamp(PLOTSTARTDATE):]
         dailyareaDF[PLOTVAR] = dailyareaDF[PLOTVAR].astype("category")
         dailyareaDF[PLOTVAR] = dailyareaDF[PLOTVAR].cat.set_categories(big_fires_regions)
         dailyareaDF.sort_values(PLOTVAR, inplace=True)
         infix = f'regions > {areathreshold:,} acres burned '
     else:
-        dailyareaDF.loc[PLOTSTARTDATE:]
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.lineplot(data=dailyareaDF, x='reportdate', y='Acres', 
+        dailyareaDF = dailyareaDF.loc[pd.Timestamp(PLOTSTARTDATE):]
+    dailyareaDF = dailyareaDF.reset_index()
+    reuse_ax = ax is not None
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+    fig = ax.get_figure()
+    sns.lineplot(data=dailyareaDF, x='reportdate', y='Acres',
                 hue=PLOTVAR, ax=ax, palette=sns.color_palette(cc.glasbey))
-    plt.title(f"{YEAR} daily area burned by {PLOTVAR} {infix}(from AICC Situation Reports)")
-    plt.xlabel("Date of situation report")
+    ax.set_title(f"{YEAR} daily area burned by {PLOTVAR} {infix}(from AICC Situation Reports)")
+    ax.set_xlabel("Date of situation report")
     ax.yaxis.set_major_formatter(mpl.ticker.StrMethodFormatter('{x:,.0f}'))
-    plt.tight_layout()
+    fig.tight_layout()
     if savefig:
         outfp = figdir / f"dailyarea_{region}_{plotday}.png"
         fig.savefig(outfp, bbox_inches='tight')
         print(f"Saved figure to {outfp}")
-        plt.close()
+        if not reuse_ax:
+            plt.close(fig)
     else:
         plt.show()
-    return None 
+    return None
 
 def plot_dailytotals_by_year(dailyareaDF: pd.DataFrame,
                              olddata: bool=True,
                              annualthreshold: int=None,
                              figdir: Path=None,
                              today: str=None,
-                             savefig=True) -> None:
-    """Plot daily burned area totals by year"""
-    import matplotlib.pyplot as plt
-    import matplotlib as mpl
-    import seaborn as sns
-    import colorcet as cc
-    mpl.rcParams['figure.dpi'] = 150
-    sns.set_theme('paper')
-    sns.set_style('whitegrid')
-    fig, ax = plt.subplots(figsize=(10, 6))
+                             savefig=True,
+                             ax=None) -> None:
+    """Plot daily burned area totals by year
+
+    Pass an existing Axes to reuse one Figure across batched calls
+    (clear it with ax.cla() between plots); it is then left open for
+    the caller.
+    """
+    plt, mpl, sns, cc = _plot_ctx()
+    reuse_ax = ax is not None
+    if ax is None:
+        _, ax = plt.subplots(figsize=(10, 6))
+    fig = ax.get_figure()
     if olddata:
-        dailyareaDF['reportdate'] = dailyareaDF.reportdate.map(lambda t: t.replace(year=YEAR))
+        # project every season onto the current year for overplotting, in
+        # one vectorized construction instead of a Python call per row
+        s = dailyareaDF['reportdate']
+        dailyareaDF['reportdate'] = pd.to_datetime(
+            {'year': YEAR, 'month': s.dt.month, 'day': s.dt.day})
         infix = ''
         if annualthreshold:
-            big_fires_years = dailyareaDF[dailyareaDF.Acres > annualthreshold].sort_values(
-                'Acres', ascending=False).drop_duplicates('Year').Year.to_list()
+            big_fires_years = dailyareaDF.loc[dailyareaDF['Acres'] > annualthreshold].groupby(
+                'Year', sort=False, observed=True)['Acres'].max().sort_values(
+                ascending=False).index.to_list()
             dailyareaDF = dailyareaDF[dailyareaDF.Year.isin(big_fires_years)]
             infix = f" (years > {annualthreshold:,} acres total)"
         sns.lineplot(data=dailyareaDF, x='reportdate', y='Acres', 
                     hue='Year', ax=ax, palette=sns.color_palette(cc.glasbey))
         ax.xaxis.set_major_formatter(mpl.dates.DateFormatter('%m-%d'))
-        plt.title("Daily area burned by Fire Season")
+        ax.set_title("Daily area burned by Fire Season")
     else:
-        sns.lineplot(data=dailyareaDF.loc[PLOTSTARTDATE:], x='reportdate', y='Acres', 
+        # incoming frame is indexed by reportdate here; sort so the date
+        # slice bisects, then restore the column for seaborn
+        dailyareaDF = dailyareaDF.sort_index().loc[
+            pd.Timestamp(PLOTSTARTDATE):].reset_index()
+        sns.lineplot(data=dailyareaDF, x='reportdate', y='Acres',
                     ax=ax)
-        plt.title(f"{YEAR} daily area burned (from AICC Situation Reports)")
+        ax.set_title(f"{YEAR} daily area burned (from AICC Situation Reports)")
     ax.yaxis.set_major_formatter(mpl.ticker.StrMethodFormatter('{x:,.0f}'))
     ax.set_xlabel("Date")
-    plt.tight_layout()
+    fig.tight_layout()
     if savefig:
         outfp = figdir / f"dailytotals_by_year_{'olddata' if olddata else '2025only'}_{today}.png"
         fig.savefig(outfp, bbox_inches='tight')
         print(f"Saved figure to {outfp}")
-        plt.close()
+        if not reuse_ax:
+            plt.close(fig)
     else:
         plt.show()
     return None
\ No newline at end of file
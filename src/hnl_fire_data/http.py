@@ -0,0 +1,24 @@
+# Shared aiohttp session for all async downloads. Everything we fetch lives
+# on fire.ak.blm.gov, so pooling connections in one place amortizes the DNS
+# lookup and TLS handshake across all endpoints.
+
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+@asynccontextmanager
+async def get_session(session: aiohttp.ClientSession=None):
+    """Yield a pooled ClientSession, or pass through one supplied by the caller
+
+    A caller-supplied session is reused and left open on exit, so nested
+    network functions can share one session; otherwise a fresh pooled
+    session is created and closed when the context ends.
+    """
+    if session is not None:
+        yield session
+        return
+    connector = aiohttp.TCPConnector(limit=10, limit_per_host=5, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, timeout=TIMEOUT) as new_session:
+        yield new_session